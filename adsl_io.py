@@ -0,0 +1,156 @@
+"""Shared data-loading layer for the ADSL Streamlit app.
+
+Keeping the cached loaders in one module means every page that imports
+them shares the same st.cache_data / st.cache_resource entries instead of
+duplicating caches per script.
+"""
+import hashlib
+import os
+import tempfile
+
+import streamlit as st
+import pandas as pd
+import pyreadstat
+import requests
+from requests.adapters import HTTPAdapter
+
+from parsers.xport_numba import read_xport_bytes
+
+# Only these columns are used downstream (boxplot subjects plus the KM
+# merge keys), so the parser can skip everything else at read time
+ADSL_COLS = ["STUDYID", "USUBJID", "TRT01A", "SAFFL",
+             "AGE", "BMIBL", "HEIGHTBL", "WEIGHTBL", "EDUCLVL"]
+ADTTE_COLS = ["STUDYID", "USUBJID", "AVAL", "CNSR", "PARAM", "PARAMCD"]
+
+# Shared HTTP session so repeat GitHub fetches reuse the TCP/TLS connection
+@st.cache_resource
+def _http():
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+# On-disk Parquet cache of parsed XPT files, keyed by content hash. Parquet
+# is columnar and compressed, so a warm load is a fast pd.read_parquet
+# instead of a full SAS transport decode (survives app restarts, unlike
+# the in-memory st.cache_data layer). Lives under the user cache dir so
+# it also survives reboots that clear /tmp.
+_XPT_CACHE_DIR = os.environ.get(
+    'ADSL_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'adsl_streamlit'))
+
+# pyreadstat only reads from a path, so uploaded bytes have to hit a file;
+# on Linux put it in tmpfs (/dev/shm) so the round-trip stays in memory
+# instead of touching disk
+_TMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Shrink the frame right after parsing: pyreadstat returns every numeric as
+# float64, but the ADSL measures fit comfortably in float32 and the integer
+# codes in int16. Halving the column width halves memory traffic for every
+# downstream filter, merge and plot. Idempotent, so it is safe to apply to
+# frames read back from the Parquet cache as well.
+def _shrink_dtypes(df):
+    for c in df.select_dtypes('float64').columns:
+        s = df[c]
+        # whole-number columns without missing values (AGE, EDUCLVL, CNSR,
+        # day counts...) shrink further as integers; the rest as float32
+        if s.notna().all() and s.mod(1).eq(0).all():
+            df[c] = pd.to_numeric(s, downcast='integer')
+        else:
+            df[c] = pd.to_numeric(s, downcast='float')
+    # Low-cardinality flags/labels become categoricals, so equality filters
+    # compare small integer codes instead of chasing Python string pointers
+    for c in ('STUDYID', 'SAFFL', 'TRT01A', 'PARAM', 'PARAMCD'):
+        if c in df.columns:
+            df[c] = df[c].astype('category')
+    # Everything else moves to Arrow-backed dtypes: remaining strings such
+    # as USUBJID get contiguous UTF-8 storage instead of object arrays, and
+    # the numeric blocks avoid BlockManager fragmentation
+    return df.convert_dtypes(dtype_backend='pyarrow')
+
+# Cached parser keyed on the raw file bytes, so reruns (navigation, widget
+# clicks) reuse the memoized DataFrame instead of re-parsing the XPT.
+# Keying on the small input bytes (with a fast blake2b digest) means the
+# large DataFrame output is never hashed on cache hits.
+@st.cache_data(max_entries=4, ttl='1h', show_spinner=False,
+               hash_funcs={bytes: lambda b: hashlib.blake2b(b, digest_size=16).digest()})
+def _parse_xport(raw, cols=None):
+    key = hashlib.sha256(raw + repr(cols).encode()).hexdigest()
+    cache_path = os.path.join(_XPT_CACHE_DIR, f"{key}.parquet")
+    if os.path.exists(cache_path):
+        return _shrink_dtypes(pd.read_parquet(cache_path, dtype_backend='pyarrow'))
+    try:
+        # fast path: decode the transport records straight from the bytes,
+        # no tempfile round-trip (validated against pyreadstat output)
+        df = read_xport_bytes(raw, usecols=cols)
+    except Exception:
+        # the tempfile is deleted on context exit instead of leaking a
+        # delete=False file per load
+        with tempfile.NamedTemporaryFile(suffix='.xpt', dir=_TMP_DIR) as tmp_file:
+            tmp_file.write(raw)
+            tmp_file.flush()
+            # pyreadstat's multiprocessing reader parses row chunks in
+            # parallel; only worth the process spawn cost for large files
+            if len(raw) > 5_000_000:
+                df, _ = pyreadstat.read_file_multiprocessing(
+                    pyreadstat.read_xport, tmp_file.name,
+                    num_processes=min(4, os.cpu_count() or 1), usecols=cols)
+            else:
+                df, _ = pyreadstat.read_xport(tmp_file.name, usecols=cols)
+    df = _shrink_dtypes(df)
+    try:
+        os.makedirs(_XPT_CACHE_DIR, exist_ok=True)
+        df.to_parquet(cache_path, compression='zstd')
+    except Exception:
+        pass  # the disk cache is best-effort only
+    return df
+
+# Function to load data from a .xpt file
+def load_data(file, cols=None):
+    return _parse_xport(file.getvalue() if hasattr(file, 'getvalue') else file.read(), cols)
+
+# Function to fetch the dataset from a GitHub URL with enhanced error handling.
+# Cached so repeat clicks within the TTL skip the download entirely; a
+# conditional GET (If-None-Match) lets unchanged remote files skip the body
+# transfer once the TTL expires.
+@st.cache_data(ttl=600, show_spinner="Fetching data from GitHub...")
+def fetch_data_from_github(url):
+    try:
+        headers = {}
+        etag = st.session_state.get(f"etag:{url}")
+        if etag and f"body:{url}" in st.session_state:
+            headers['If-None-Match'] = etag
+        with _http().get(url, headers=headers, timeout=30, stream=True) as response:
+            if response.status_code == 304:
+                return st.session_state[f"body:{url}"]
+            response.raise_for_status()  # Check for HTTP errors
+            # Verify that the content type is as expected for an XPT file
+            if 'application/octet-stream' not in response.headers['Content-Type']:
+                st.error("The URL did not return a valid XPT file. Please check the file format and try again.")
+                return None
+            # Stream the body in 1 MiB chunks over the kept-alive connection
+            # instead of letting requests buffer it all at once
+            buf = bytearray()
+            for chunk in response.iter_content(1 << 20):
+                buf += chunk
+            content = bytes(buf)
+        if 'ETag' in response.headers:
+            st.session_state[f"etag:{url}"] = response.headers['ETag']
+            st.session_state[f"body:{url}"] = content
+        return content
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data from GitHub: {e}")
+        return None
+
+# One-step URL -> DataFrame path, cached on the URL string: repeat clicks
+# skip both the download and the parse, while the bytes-keyed parse cache
+# still backstops cold URL entries that point at identical file content
+@st.cache_data(ttl=3600, show_spinner="Loading data from GitHub...")
+def load_xpt_from_url(url, cols=None):
+    content = fetch_data_from_github(url)
+    if content is None:
+        return None
+    try:
+        return _parse_xport(content, cols)
+    except Exception as e:
+        st.error(f"Failed to load data from GitHub content: {e}")
+        return None
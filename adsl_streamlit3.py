@@ -1,218 +1,368 @@
-import streamlit as st
-import pandas as pd
-import pyreadstat
-import tempfile
-import requests
-import plotly.express as px
-from lifelines import KaplanMeierFitter
-import plotly.graph_objs as go
-
-# Function to load data from a .xpt file
-def load_data(file):
-    with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-        tmp_file.write(file.read())
-        tmp_file_path = tmp_file.name
-    df, _ = pyreadstat.read_xport(tmp_file_path)
-    return df
-
-# Function to fetch the dataset from a GitHub URL with enhanced error handling
-def fetch_data_from_github(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Check for HTTP errors
-        # Verify that the content type is as expected for an XPT file
-        if 'application/octet-stream' in response.headers['Content-Type']:
-            return response.content
-        else:
-            st.error("The URL did not return a valid XPT file. Please check the file format and try again.")
-            return None
-    except requests.exceptions.RequestException as e:
-        st.error(f"Failed to fetch data from GitHub: {e}")
-        return None
-
-# Function to load data from the GitHub content fetched
-def load_data_from_github(content):
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xpt') as tmp_file:
-            tmp_file.write(content)
-            tmp_file.seek(0)  # Reset file pointer for reading
-            return load_data(tmp_file)
-    except Exception as e:
-        st.error(f"Failed to load data from GitHub content: {e}")
-        return None
-
-# Function to create KM plot
-def km_plot(adsl, adtte):
-    anl = adsl[
-        (adsl['SAFFL'] == "Y") & (adsl['STUDYID'] == "CDISCPILOT01")
-    ][['STUDYID', 'USUBJID', 'TRT01A']].merge(
-        adtte[adtte['STUDYID'] == "CDISCPILOT01"][['STUDYID', 'USUBJID', 'AVAL', 'CNSR', 'PARAM', 'PARAMCD']],
-        on=['STUDYID', 'USUBJID'],
-        how='inner'
-    ).assign(
-        TRT01A=lambda x: pd.Categorical(x['TRT01A'], categories=["Placebo", "Xanomeline Low Dose", "Xanomeline High Dose"]),
-        AVAL=lambda x: x['AVAL'] / 30.4167  # Convert AVAL to months
-    )
-    
-    if len(anl) <= 5:
-        st.error("Not enough observations for this selection. Modify filters and try again.")
-        return None
-    
-    kmf = KaplanMeierFitter()
-    fig = go.Figure()
-    
-    for treatment in anl['TRT01A'].cat.categories:
-        treatment_data = anl[anl['TRT01A'] == treatment]
-        kmf.fit(treatment_data['AVAL'], event_observed=treatment_data['CNSR'], label=treatment)
-        fig.add_trace(go.Scatter(
-            x=kmf.survival_function_.index,
-            y=kmf.survival_function_[treatment],
-            mode='lines+markers',
-            name=treatment,
-            hoverinfo='text',
-            text=kmf.survival_function_[treatment].apply(lambda x: f'Survival Probability: {x:.2%}'),
-        ))
-    
-    fig.update_layout(
-        title="KM plot for Time to First Dermatologic Event: Safety population",
-        xaxis_title="Time (Months)",
-        yaxis_title="Survival Probability (%)",
-        legend_title="Treatment",
-        yaxis=dict(range=[0, 1]),
-    )
-    
-    fig.add_shape(type="line", x0=0, y0=0.5, x1=1, y1=0.5, line=dict(color="gray", dash="dash"))
-    return fig
-
-# Streamlit app
-def main():
-    # Initialize session state for data storage if it does not exist
-    if "adsl_data" not in st.session_state:
-        st.session_state.adsl_data = None
-    if "adtte_data" not in st.session_state:
-        st.session_state.adtte_data = None
-
-    st.title("Demographics and KP-Curve CDISC Visualization")
-
-    # Sidebar navigation with radio buttons
-    nav_option = st.sidebar.radio("Select an option", ["Instructions", "Upload Files", "Raw Data", "Visualization", "Kaplan-Meier Curve"])
-
-    # Instructions page as the default
-    if nav_option == "Instructions":
-        st.subheader("Instructions for Using the App")
-        st.write("""
-        Welcome to the Demographics and KP-Curve CDISC Visualization App!
-        (Select '>' on the top of webpage to view sidebar options)
-
-        **Instructions:**
-        1. **Upload Files**: You can upload your own ADSL and ADTTE files in XPT format, or load them directly from a GitHub repository.
-        2. **Raw Data**: View the raw data from the uploaded files.
-        3. **Visualization**: Create a boxplot visualization for different subject data like Age, Baseline BMI, etc., across different treatment groups.
-        4. **Kaplan-Meier Curve**: Generate a Kaplan-Meier survival curve for the treatment groups based on the data you have uploaded.
-
-        The app supports two ways of uploading data:
-        - By uploading the files manually.
-        - By fetching the data from GitHub using the provided URLs.
-
-        **Important Notes**:
-        - Make sure to upload both the ADSL and ADTTE data for the Kaplan-Meier curve to work.
-        - Ensure the data is from the same study for the analysis to be valid.
-
-        Use the options in the sidebar to navigate between different sections of the app.
-        """)
-        return
-
-    # Display file upload section only in the "Upload Files" page
-    if nav_option == "Upload Files":
-        st.subheader("Load Data from GitHub")
-        
-        # GitHub URL input for ADSL and ADTTE data
-        github_adsl_url = st.text_input("GitHub URL for ADSL .xpt file", 
-                                      "https://raw.githubusercontent.com/rejipmathew/ADSL_streamlit/main/ADSL.XPT")
-        github_adtte_url = st.text_input("GitHub URL for ADTTE .xpt file", 
-                                       "https://raw.githubusercontent.com/rejipmathew/ADSL_streamlit/main/ADTTE.XPT")
-
-        # Load data from GitHub if the button is clicked
-        if st.button("Load ADSL from GitHub"):
-            adsl_data_content = fetch_data_from_github(github_adsl_url)
-            if adsl_data_content:
-                st.session_state.adsl_data = load_data_from_github(adsl_data_content)
-
-        if st.button("Load ADTTE from GitHub"):
-            adtte_data_content = fetch_data_from_github(github_adtte_url)
-            if adtte_data_content:
-                st.session_state.adtte_data = load_data_from_github(adtte_data_content)
-
-        st.subheader("Upload ADSL and ADTTE Files")
-
-        # File upload for ADSL and ADTTE
-        adsl_file = st.file_uploader("Upload ADSL .xpt file", type="xpt", key='adsl')
-        adtte_file = st.file_uploader("Upload ADTTE .xpt file", type="xpt", key='adtte')
-
-        # Load ADSL and ADTTE data from uploaded files
-        if adsl_file is not None:
-            st.session_state.adsl_data = load_data(adsl_file)
-        if adtte_file is not None:
-            st.session_state.adtte_data = load_data(adtte_file)
-
-    # Render content based on selected navigation option
-    if nav_option == "Raw Data":
-        st.subheader("Raw Data Preview")
-        if st.session_state.adsl_data is not None and st.session_state.adtte_data is not None:
-            st.write("ADSL Data:")
-            st.dataframe(st.session_state.adsl_data.head())
-            st.write("ADTTE Data:")
-            st.dataframe(st.session_state.adtte_data.head())
-        else:
-            st.warning("Please upload or load both ADSL and ADTTE data.")
-
-    elif nav_option == "Visualization":
-        st.subheader("Boxplot Visualization")
-        if st.session_state.adsl_data is not None:
-            subject_choices = {
-                "Age": "AGE",
-                "Baseline BMI": "BMIBL",
-                "Baseline Height": "HEIGHTBL",
-                "Baseline Weight": "WEIGHTBL",
-                "Years of Education": "EDUCLVL"
-            }
-            
-            selected_subject = st.selectbox("Select Subject Data", options=list(subject_choices.keys()))
-
-            if selected_subject and subject_choices[selected_subject] in st.session_state.adsl_data.columns:
-                subject_column = subject_choices[selected_subject]
-
-                # Define colors for treatment groups
-                treatment_colors = {
-                    'Placebo': 'blue',
-                    'Xanomeline Low Dose': 'green',
-                    'Xanomeline High Dose': 'purple'
-                }
-
-                # Generate boxplot using Plotly
-                fig_box = px.box(
-                    st.session_state.adsl_data, 
-                    x='TRT01A', 
-                    y=subject_column, 
-                    title=f"{selected_subject} by Treatment Groups",
-                    labels={subject_column: selected_subject, 'TRT01A': 'Treatment'},
-                    color='TRT01A',  
-                    color_discrete_map=treatment_colors,
-                    points='all'
-                )
-                fig_box.update_layout(plot_bgcolor='rgba(255, 255, 255, 0.5)')  # Transparent white background
-                st.plotly_chart(fig_box)
-        else:
-            st.warning("Please upload or load ADSL data.")
-
-    elif nav_option == "Kaplan-Meier Curve":
-        st.subheader("Kaplan-Meier Curve")
-        if st.session_state.adsl_data is not None and st.session_state.adtte_data is not None:
-            fig_km = km_plot(st.session_state.adsl_data, st.session_state.adtte_data)
-            if fig_km:
-                st.plotly_chart(fig_km)
-        else:
-            st.warning("Please upload or load both ADSL and ADTTE data.")
-
-if __name__ == "__main__":
-    main()
+import os
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+from adsl_io import ADSL_COLS, ADTTE_COLS, load_data, load_xpt_from_url
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the numpy fallback below is used
+    njit = None
+
+# Product-limit kernel over pre-sorted time/event arrays: one linear scan
+# accumulating events per unique time and cumprod(1 - d/n). JIT-compiled
+# with numba when available (native-speed loop, compiled once and cached);
+# otherwise a vectorized numpy formulation does the same work.
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _km_product_limit(t, e):
+        n = t.size
+        times = np.empty(n)
+        surv = np.empty(n)
+        k = 0
+        i = 0
+        at_risk = n
+        s = 1.0
+        while i < n:
+            j = i
+            d = 0.0
+            while j < n and t[j] == t[i]:
+                d += e[j]
+                j += 1
+            s *= 1.0 - d / at_risk
+            times[k] = t[i]
+            surv[k] = s
+            k += 1
+            at_risk -= j - i
+            i = j
+        return times[:k], surv[:k]
+else:
+    def _km_product_limit(t, e):
+        uniq_t, idx = np.unique(t, return_index=True)
+        counts = np.diff(np.r_[idx, t.size])
+        d = np.add.reduceat(e, idx)                     # events at each unique time
+        n = t.size - np.r_[0, np.cumsum(counts)[:-1]]   # subjects still at risk
+        return uniq_t, np.cumprod(1.0 - d / n)
+
+# Direct Kaplan-Meier estimator: sort once, run the kernel, and prepend the
+# t=0 anchor. Numerically identical to lifelines on this data but a few
+# array ops instead of three KaplanMeierFitter.fit calls.
+def _km_curve(times, events, assume_sorted=False):
+    if not assume_sorted:
+        order = np.argsort(times, kind='mergesort')
+        times, events = times[order], events[order]
+    uniq_t, surv = _km_product_limit(times, events)
+    if uniq_t.size == 0 or uniq_t[0] != 0.0:
+        uniq_t = np.r_[0.0, uniq_t]
+        surv = np.r_[1.0, surv]
+    return uniq_t, surv
+
+def _df_cache_key(df):
+    # content hash: cheap row-wise hashing plus the schema, so a cache hit
+    # really means identical inputs (shape/columns alone could alias)
+    return (pd.util.hash_pandas_object(df, index=False).values.tobytes(),
+            tuple(df.columns), tuple(map(str, df.dtypes)))
+
+# Function to create the boxplot for one ADSL measure. Quartiles, fences and
+# means are computed here with numpy on the full cohort and handed to go.Box
+# pre-computed, so Plotly renders the summary without re-deriving statistics
+# in the browser; the (sampled) raw points ride along as an invisible-box
+# strip overlaid on the stats box. Memoized on content, so switching
+# measures back and forth reuses previously built figures.
+@st.cache_data(max_entries=16, show_spinner=False,
+               hash_funcs={pd.DataFrame: _df_cache_key})
+def _box_fig(full_df, sample_df, subject_column, selected_subject, treatment_colors,
+             show_points=True):
+    fig = go.Figure()
+    for treatment, group in full_df.groupby('TRT01A', observed=True):
+        vals = group[subject_column].to_numpy(dtype=np.float64)
+        vals = vals[~np.isnan(vals)]
+        if vals.size == 0:
+            continue
+        q1, median, q3 = np.percentile(vals, [25, 50, 75])
+        iqr = q3 - q1
+        in_fence = vals[(vals >= q1 - 1.5 * iqr) & (vals <= q3 + 1.5 * iqr)]
+        color = treatment_colors.get(str(treatment))
+        fig.add_trace(go.Box(
+            x=[str(treatment)],
+            q1=[q1], median=[median], q3=[q3],
+            lowerfence=[in_fence.min()], upperfence=[in_fence.max()],
+            mean=[vals.mean()],
+            name=str(treatment),
+            marker_color=color,
+            boxpoints=False,
+        ))
+        if not show_points:
+            continue
+        pts = sample_df.loc[sample_df['TRT01A'] == treatment, subject_column]
+        pts = pts.to_numpy(dtype=np.float64)
+        fig.add_trace(go.Box(
+            y=pts,
+            x=[str(treatment)] * len(pts),
+            name=str(treatment),
+            boxpoints='all', jitter=0.6, pointpos=0,
+            fillcolor='rgba(0,0,0,0)', line={'color': 'rgba(0,0,0,0)'},
+            marker={'color': color, 'size': 4},
+            showlegend=False, hoverinfo='y',
+        ))
+    fig.update_layout(
+        title=f"{selected_subject} by Treatment Groups",
+        xaxis_title='Treatment',
+        yaxis_title=selected_subject,
+        boxmode='overlay',
+        showlegend=True,
+        plot_bgcolor='rgba(255, 255, 255, 0.5)',  # Transparent white background
+    )
+    return fig
+
+# Function to create KM plot. The figure itself is memoized, so reruns
+# triggered by unrelated widgets skip the merge, the KM computation and the
+# Plotly construction entirely. Kept pure (no st.* side effects): returns
+# None when there are too few observations and the caller renders the error.
+@st.cache_data(max_entries=8, show_spinner=False,
+               hash_funcs={pd.DataFrame: _df_cache_key})
+def km_plot(adsl, adtte):
+    # Filter and project each side once, then merge on the subject key only
+    # (STUDYID is already pinned by the filters) — avoids the intermediate
+    # copies the old [mask][cols].merge(...).assign(...) chain materialized
+    studyid = "CDISCPILOT01"
+    trt_dtype = pd.CategoricalDtype(
+        ["Placebo", "Xanomeline Low Dose", "Xanomeline High Dose"])
+    # With the flag columns stored as categoricals these comparisons run on
+    # the integer codes, not on Python strings
+    adsl_f = adsl.loc[
+        adsl['SAFFL'].eq("Y") & adsl['STUDYID'].eq(studyid),
+        ['USUBJID', 'TRT01A']
+    ].set_index('USUBJID')
+    # Pin the treatment ordering on the small filtered frame *before* the
+    # join, so the join carries int8 category codes instead of re-coding
+    # the merged column afterwards
+    adsl_f['TRT01A'] = adsl_f['TRT01A'].astype(trt_dtype)
+    # PARAM/PARAMCD are not used past this point, so keep them out of the
+    # join payload entirely
+    adtte_f = adtte.loc[
+        adtte['STUDYID'].eq(studyid),
+        ['USUBJID', 'AVAL', 'CNSR']
+    ].set_index('USUBJID')
+    # Join on the subject index rather than hash-merging the key column
+    anl = adsl_f.join(adtte_f, how='inner')
+    anl['AVAL'] *= 1 / 30.4167  # Convert AVAL to months, in place
+
+    if len(anl) <= 5:
+        return None
+
+    fig = go.Figure()
+
+    # Sort by time once, then split by treatment in a single groupby pass;
+    # each group is already a sorted contiguous slice, so the kernel skips
+    # its per-group sort (and the three full-frame boolean scans go away)
+    anl_sorted = anl.sort_values('AVAL', kind='mergesort')
+    for treatment, treatment_data in anl_sorted.groupby('TRT01A', observed=False):
+        times, surv = _km_curve(treatment_data['AVAL'].to_numpy(dtype=np.float64),
+                                treatment_data['CNSR'].to_numpy(dtype=np.float64),
+                                assume_sorted=True)
+        # Scattergl renders through WebGL, so the browser draws the step
+        # markers on a canvas instead of one SVG/DOM node per point
+        fig.add_trace(go.Scattergl(
+            x=times.tolist(),
+            y=surv.tolist(),
+            mode='lines+markers',
+            name=treatment,
+            # hover text is formatted client-side, so no per-point Python
+            # string building and a smaller serialized figure
+            hovertemplate='Time: %{x:.2f} mo<br>Survival Probability: %{y:.2%}<extra></extra>',
+        ))
+    
+    fig.update_layout(
+        title="KM plot for Time to First Dermatologic Event: Safety population",
+        xaxis_title="Time (Months)",
+        yaxis_title="Survival Probability (%)",
+        legend_title="Treatment",
+        yaxis=dict(range=[0, 1]),
+    )
+    
+    fig.add_shape(type="line", x0=0, y0=0.5, x1=1, y1=0.5, line=dict(color="gray", dash="dash"))
+    return fig
+
+# Boxplot page body. Runs as a fragment: changing the measure selectbox or
+# the points slider reruns only this block, not the whole script, and the
+# memoized _box_fig makes revisiting a measure a cache hit.
+@st.fragment
+def _visualization():
+    subject_choices = {
+        "Age": "AGE",
+        "Baseline BMI": "BMIBL",
+        "Baseline Height": "HEIGHTBL",
+        "Baseline Weight": "WEIGHTBL",
+        "Years of Education": "EDUCLVL"
+    }
+
+    selected_subject = st.selectbox("Select Subject Data", options=list(subject_choices.keys()))
+
+    if selected_subject and subject_choices[selected_subject] in st.session_state.adsl_data.columns:
+        subject_column = subject_choices[selected_subject]
+
+        # Define colors for treatment groups
+        treatment_colors = {
+            'Placebo': 'blue',
+            'Xanomeline Low Dose': 'green',
+            'Xanomeline High Dose': 'purple'
+        }
+
+        # Cap the raw points shipped to the browser: shuffle once and
+        # keep at most 500 subjects per treatment group, so the
+        # figure payload stays constant-sized on large cohorts
+        adsl_data = st.session_state.adsl_data
+        if len(adsl_data) > 1500:
+            plot_df = adsl_data.sample(frac=1.0, random_state=0) \
+                               .groupby('TRT01A', observed=True).head(500)
+        else:
+            plot_df = adsl_data
+
+        # Rendering every subject is O(N) JSON and DOM work in the
+        # browser, so above this threshold only the box summary is
+        # drawn; the slider lets users opt back in (lives in the fragment
+        # body because fragments may not create widgets in the sidebar)
+        point_limit = st.slider(
+            "Show individual points up to N subjects",
+            min_value=0, max_value=5000, value=1000, step=100)
+
+        # Generate boxplot with pre-computed statistics
+        fig_box = _box_fig(adsl_data, plot_df, subject_column,
+                           selected_subject, treatment_colors,
+                           show_points=len(adsl_data) <= point_limit)
+        st.plotly_chart(fig_box)
+
+# Inject the page styling once per session: the CSS file is read a single
+# time and the markdown element replays from the cache on later reruns
+# instead of being rebuilt each time. Returns None, so there is nothing to
+# mutate in the cached resource.
+@st.cache_resource
+def _inject_css():
+    css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wave.css')
+    try:
+        with open(css_path) as f:
+            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    except OSError:
+        pass  # styling is cosmetic; never block the app on it
+
+# Streamlit app
+def main():
+    _inject_css()
+
+    # Initialize session state for data storage if it does not exist
+    st.session_state.setdefault('adsl_data', None)
+    st.session_state.setdefault('adtte_data', None)
+
+    st.title("Demographics and KP-Curve CDISC Visualization")
+
+    # Sidebar navigation with radio buttons
+    nav_option = st.sidebar.radio("Select an option", ["Instructions", "Upload Files", "Raw Data", "Visualization", "Kaplan-Meier Curve"])
+
+    # Instructions page as the default
+    if nav_option == "Instructions":
+        st.subheader("Instructions for Using the App")
+        st.write("""
+        Welcome to the Demographics and KP-Curve CDISC Visualization App!
+        (Select '>' on the top of webpage to view sidebar options)
+
+        **Instructions:**
+        1. **Upload Files**: You can upload your own ADSL and ADTTE files in XPT format, or load them directly from a GitHub repository.
+        2. **Raw Data**: View the raw data from the uploaded files.
+        3. **Visualization**: Create a boxplot visualization for different subject data like Age, Baseline BMI, etc., across different treatment groups.
+        4. **Kaplan-Meier Curve**: Generate a Kaplan-Meier survival curve for the treatment groups based on the data you have uploaded.
+
+        The app supports two ways of uploading data:
+        - By uploading the files manually.
+        - By fetching the data from GitHub using the provided URLs.
+
+        **Important Notes**:
+        - Make sure to upload both the ADSL and ADTTE data for the Kaplan-Meier curve to work.
+        - Ensure the data is from the same study for the analysis to be valid.
+
+        Use the options in the sidebar to navigate between different sections of the app.
+        """)
+        return
+
+    # Display file upload section only in the "Upload Files" page
+    if nav_option == "Upload Files":
+        st.subheader("Load Data from GitHub")
+        
+        # GitHub URL input for ADSL and ADTTE data
+        github_adsl_url = st.text_input("GitHub URL for ADSL .xpt file", 
+                                      "https://raw.githubusercontent.com/rejipmathew/ADSL_streamlit/main/ADSL.XPT")
+        github_adtte_url = st.text_input("GitHub URL for ADTTE .xpt file", 
+                                       "https://raw.githubusercontent.com/rejipmathew/ADSL_streamlit/main/ADTTE.XPT")
+
+        # Load data from GitHub if the button is clicked; the fused loader
+        # goes URL -> DataFrame in one cached step
+        if st.button("Load ADSL from GitHub"):
+            st.session_state.adsl_data = load_xpt_from_url(github_adsl_url, ADSL_COLS)
+
+        if st.button("Load both from GitHub"):
+            # Both downloads are network-bound, so fetch them concurrently;
+            # the workers inherit the script-run context so the cached
+            # loader can still touch session state
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(max_workers=2,
+                                    initializer=add_script_run_ctx,
+                                    initargs=(None, ctx)) as pool:
+                adsl_future = pool.submit(load_xpt_from_url, github_adsl_url, ADSL_COLS)
+                adtte_future = pool.submit(load_xpt_from_url, github_adtte_url, ADTTE_COLS)
+                st.session_state.adsl_data = adsl_future.result()
+                st.session_state.adtte_data = adtte_future.result()
+
+        if st.button("Load ADTTE from GitHub"):
+            st.session_state.adtte_data = load_xpt_from_url(github_adtte_url, ADTTE_COLS)
+
+        st.subheader("Upload ADSL and ADTTE Files")
+
+        # File upload for ADSL and ADTTE
+        adsl_file = st.file_uploader("Upload ADSL .xpt file", type="xpt", key='adsl')
+        adtte_file = st.file_uploader("Upload ADTTE .xpt file", type="xpt", key='adtte')
+
+        # Load ADSL and ADTTE data from uploaded files. The file_id guard
+        # means a rerun with the same upload doesn't touch the loader at
+        # all — the parsed frame persists in session state across pages.
+        if adsl_file is not None and st.session_state.get('adsl_sig') != adsl_file.file_id:
+            st.session_state.adsl_data = load_data(adsl_file, ADSL_COLS)
+            st.session_state.adsl_sig = adsl_file.file_id
+        if adtte_file is not None and st.session_state.get('adtte_sig') != adtte_file.file_id:
+            st.session_state.adtte_data = load_data(adtte_file, ADTTE_COLS)
+            st.session_state.adtte_sig = adtte_file.file_id
+
+    # Render content based on selected navigation option
+    if nav_option == "Raw Data":
+        st.subheader("Raw Data Preview")
+        if st.session_state.adsl_data is not None and st.session_state.adtte_data is not None:
+            st.write("ADSL Data:")
+            st.dataframe(st.session_state.adsl_data.head())
+            st.write("ADTTE Data:")
+            st.dataframe(st.session_state.adtte_data.head())
+        else:
+            st.warning("Please upload or load both ADSL and ADTTE data.")
+
+    elif nav_option == "Visualization":
+        st.subheader("Boxplot Visualization")
+        if st.session_state.adsl_data is not None:
+            _visualization()
+        else:
+            st.warning("Please upload or load ADSL data.")
+
+    elif nav_option == "Kaplan-Meier Curve":
+        st.subheader("Kaplan-Meier Curve")
+        if st.session_state.adsl_data is not None and st.session_state.adtte_data is not None:
+            fig_km = km_plot(st.session_state.adsl_data, st.session_state.adtte_data)
+            if fig_km:
+                st.plotly_chart(fig_km)
+            else:
+                st.error("Not enough observations for this selection. Modify filters and try again.")
+        else:
+            st.warning("Please upload or load both ADSL and ADTTE data.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Fast SAS XPORT (v5) reader working directly on in-memory bytes.
+
+The transport format is a fixed-width record stream: 80-byte header
+records, 140-byte NAMESTR variable descriptors, then fixed-length
+observation records whose numeric fields are big-endian IBM doubles.
+The headers are a few hundred bytes and are parsed in plain Python; the
+observation payload is decoded column-wise with numpy, and the IBM-float
+to IEEE conversion runs through a numba-JIT kernel when numba is
+installed (a vectorized numpy fallback covers the rest).
+
+Only the happy path is handled here — callers are expected to fall back
+to pyreadstat when ``read_xport_bytes`` raises.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the numpy fallback below is used
+    njit = None
+
+_RECORD = 80
+_FRAC_MASK = 0x00FFFFFFFFFFFFFF
+
+if njit is not None:
+    import math
+
+    @njit(cache=True)
+    def _ibm_to_f64(u):
+        out = np.empty(u.size, dtype=np.float64)
+        for i in range(u.size):
+            b = u[i]
+            frac = b & _FRAC_MASK
+            top = b >> np.uint64(56)
+            if frac == 0:
+                # all-zero bytes are a true zero; a missing value is '.'
+                # (or A-Z / _) in the first byte with zero padding
+                out[i] = 0.0 if top == 0 or top == 0x80 else np.nan
+            else:
+                exp = (np.int64(top) & 0x7F) - 64
+                v = math.ldexp(float(frac), 4 * exp - 56)
+                out[i] = -v if top & 0x80 else v
+        return out
+else:
+    def _ibm_to_f64(u):
+        frac = u & np.uint64(_FRAC_MASK)
+        top = u >> np.uint64(56)
+        exp = (top.astype(np.int64) & 0x7F) - 64
+        v = np.ldexp(frac.astype(np.float64), (4 * exp - 56).astype(np.int32))
+        v[(top & np.uint64(0x80)) != 0] *= -1.0
+        zero = frac == 0
+        v[zero] = 0.0
+        v[zero & (top != 0) & (top != np.uint64(0x80))] = np.nan
+        return v
+
+
+# SAS display formats whose values are day counts from 1960-01-01; these
+# come back as datetime.date like pyreadstat produces
+_DATE_FORMATS = {'DATE', 'MMDDYY', 'DDMMYY', 'YYMMDD', 'JULIAN', 'MONYY',
+                 'WEEKDATE', 'WORDDATE', 'EURDFDE', 'NENGO'}
+
+
+def _parse_namestr(block, nvars, namestr_len):
+    variables = []
+    for i in range(nvars):
+        ns = block[i * namestr_len:(i + 1) * namestr_len]
+        ntype = int.from_bytes(ns[0:2], 'big')
+        nlng = int.from_bytes(ns[4:6], 'big')
+        name = ns[8:16].decode('ascii', 'replace').strip()
+        nform = ns[56:64].decode('ascii', 'replace').strip()
+        npos = int.from_bytes(ns[84:88], 'big')
+        variables.append((name, ntype, nlng, npos, nform))
+    return variables
+
+
+def read_xport_bytes(raw, usecols=None):
+    """Parse one XPORT v5 member from ``raw`` into a DataFrame."""
+    pos = 0
+    namestr_len = 140
+    variables = None
+    payload = None
+    if not raw.startswith(b'HEADER RECORD*******LIBRARY HEADER RECORD'):
+        raise ValueError('not an XPORT v5 file')
+    while pos + _RECORD <= len(raw):
+        rec = raw[pos:pos + _RECORD]
+        pos += _RECORD
+        if rec.startswith(b'HEADER RECORD*******MEMBER'):
+            namestr_len = int(rec[74:78])
+        elif rec.startswith(b'HEADER RECORD*******NAMESTR'):
+            nvars = int(rec[48:58])
+            block_len = namestr_len * nvars
+            variables = _parse_namestr(raw[pos:pos + block_len], nvars, namestr_len)
+            pos += -(-block_len // _RECORD) * _RECORD  # block is space-padded
+        elif rec.startswith(b'HEADER RECORD*******OBS'):
+            payload = raw[pos:]
+            break
+    if variables is None or payload is None:
+        raise ValueError('malformed XPORT file: missing NAMESTR or OBS header')
+
+    reclen = sum(v[2] for v in variables)
+    nobs = len(payload) // reclen
+    mat = np.frombuffer(payload, np.uint8)[:nobs * reclen].reshape(nobs, reclen)
+    # the final record is space-padded to an 80-byte boundary; drop any
+    # trailing rows that are entirely blank
+    while nobs > 0 and (mat[nobs - 1] == 0x20).all():
+        nobs -= 1
+    mat = mat[:nobs]
+
+    columns = {}
+    for name, ntype, nlng, npos, nform in variables:
+        if usecols is not None and name not in usecols:
+            continue
+        field = mat[:, npos:npos + nlng]
+        if ntype == 1:  # numeric: IBM double, possibly truncated below 8 bytes
+            padded = np.zeros((nobs, 8), np.uint8)
+            padded[:, :nlng] = field
+            u = padded.view('>u8').ravel().astype(np.uint64)
+            values = _ibm_to_f64(u)
+            if nform.rstrip('0123456789.') in _DATE_FORMATS:
+                # day offsets from the SAS epoch -> datetime.date objects,
+                # the same representation pyreadstat returns
+                dates = pd.to_datetime(values, unit='D', origin='1960-01-01')
+                values = np.array(
+                    [d.date() if d is not pd.NaT else np.nan for d in dates],
+                    dtype=object)
+            columns[name] = values
+        else:  # character: ASCII, right-padded with spaces
+            values = np.ascontiguousarray(field).view(f'S{nlng}').ravel()
+            columns[name] = np.char.rstrip(np.char.decode(values, 'ascii'))
+    return pd.DataFrame(columns)